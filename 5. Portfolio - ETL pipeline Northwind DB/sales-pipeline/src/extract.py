@@ -6,10 +6,169 @@ It does:
 - Executes SQL queries
 - Returns pandas dataframes
 
+The extraction queries run through ADBC, which streams the result set
+straight into Arrow memory instead of building Python tuples row by row.
 """
 
 import sqlite3
+from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import adbc_driver_sqlite.dbapi as adbc
+
+
+# Connection settings for a read-heavy workload:
+# temp tables in memory, normal sync,
+# 64 MB page cache and 256 MB of memory-mapped I/O
+# (WAL is set once by setup_database.py, read-only connections can't change it)
+SQLITE_PRAGMAS = (
+    "temp_store=memory",
+    "synchronous=normal",
+    "cache_size=-65536",
+    "mmap_size=268435456",
+)
+
+
+# Complete sales data: one row per order line, joining 6 tables
+SALES_QUERY = """
+    SELECT
+        -- NUMERIC columns store whole values as INTEGER, so they are
+        -- cast to REAL to give ADBC a single type per column
+        -- (nullable columns can still be guessed wrong: see SALES_SCHEMA)
+
+        -- Dates as Unix epoch seconds: converted to datetime without
+        -- parsing strings (NULL when missing or not a valid date)
+
+        -- Order Data
+        o.OrderID,
+        CAST(strftime('%s', o.OrderDate) AS INTEGER) AS OrderDate,
+        CAST(strftime('%s', o.ShippedDate) AS INTEGER) AS ShippedDate,
+        o.ShipCountry,
+        CAST(o.Freight AS REAL) AS Freight,
+
+        -- Customers Data
+        c.CustomerID,
+        c.CompanyName,
+        c.ContactName,
+        c.Country AS CustomerCountry,
+        c.City AS CustomerCity,
+
+        -- Product Data
+        p.ProductID,
+        p.ProductName,
+        CAST(p.UnitPrice AS REAL) AS ProductUnitPrice,
+
+        -- Category Data
+        cat.CategoryID,
+        cat.CategoryName,
+        cat.Description AS CategoryDescription,
+
+        -- Supplier Data
+        s.CompanyName AS SupplierName,
+        s.Country AS SupplierCountry,
+
+        -- Order Detail Data
+        od.Quantity,
+        CAST(od.UnitPrice AS REAL) AS UnitPrice,
+        CAST(od.Discount AS REAL) AS Discount
+
+        -- Total and DiscountAmount are calculated after the fetch
+
+    From Orders o
+    INNER JOIN "Order Details" od ON o.OrderID = od.OrderID
+    INNER JOIN Products p ON od.ProductID = p.ProductID
+    INNER JOIN Categories cat ON p.CategoryID = cat.CategoryID
+    INNER JOIN Customers c ON o.CustomerID = c.CustomerID
+    INNER JOIN Suppliers s ON p.SupplierID = s.SupplierID
+
+    -- Invalid lines are filtered here, not in pandas.
+    -- (OrderID, ProductID) is the key of "Order Details" and every
+    -- other join is on a primary key, so there are no duplicate rows
+    WHERE 
+        strftime('%s', o.OrderDate) IS NOT NULL
+        AND od.Quantity > 0
+        AND od.UnitPrice >= 0
+        AND (od.Quantity * od.UnitPrice * (1 - od.Discount)) > 0
+
+    -- OrderID, ProductID: same row order on every SQLite version
+    -- (needed to resume a stream on the sqlite3 connection)
+    ORDER BY o.OrderDate DESC, o.OrderID, od.ProductID;
+    """
+
+
+# Arrow type of each SALES_QUERY column, from the column declarations.
+# ADBC guesses the types from the first batch of rows: a nullable column
+# that is NULL in all of them (e.g. Freight of the newest, unshipped
+# orders) is guessed as int64, and the fetch fails at the first value
+# of another type. The results are cast to this schema, and the query
+# is rerun on the sqlite3 connection when ADBC fails
+SALES_SCHEMA = pa.schema([
+    ('OrderID', pa.int64()),
+    ('OrderDate', pa.int64()),
+    ('ShippedDate', pa.int64()),
+    ('ShipCountry', pa.string()),
+    ('Freight', pa.float64()),
+    ('CustomerID', pa.string()),
+    ('CompanyName', pa.string()),
+    ('ContactName', pa.string()),
+    ('CustomerCountry', pa.string()),
+    ('CustomerCity', pa.string()),
+    ('ProductID', pa.int64()),
+    ('ProductName', pa.string()),
+    ('ProductUnitPrice', pa.float64()),
+    ('CategoryID', pa.int64()),
+    ('CategoryName', pa.string()),
+    ('CategoryDescription', pa.string()),
+    ('SupplierName', pa.string()),
+    ('SupplierCountry', pa.string()),
+    ('Quantity', pa.int64()),
+    ('UnitPrice', pa.float64()),
+    ('Discount', pa.float64()),
+])
+
+
+# Narrower types for the sales columns, applied after Total and
+# DiscountAmount are calculated (those stay float64).
+# Discount also stays float64: float32(0.05) is slightly above 0.05
+# and would move the 5% discounts to the next DiscountLevel bin
+SALES_DTYPES = {
+    'OrderDate': pa.timestamp('s'),
+    'ShippedDate': pa.timestamp('s'),
+    'OrderID': pa.int32(),
+    'ProductID': pa.int32(),
+    'CategoryID': pa.int32(),
+    'Quantity': pa.int16(),
+    'UnitPrice': pa.float32(),
+    'ProductUnitPrice': pa.float32(),
+    'Freight': pa.float32(),
+}
+
+# Repeated text columns, loaded as pandas categories
+SALES_CATEGORIES = [
+    'CategoryName', 'CustomerCountry', 'ShipCountry',
+    'SupplierName', 'CompanyName',
+]
+
+
+def _is_type_mismatch(error):
+    """
+    True for the ADBC error raised when a value doesn't match the type
+    guessed for its column (see SALES_SCHEMA).
+    """
+    return 'Type mismatch' in str(error)
+
+
+def _pandas_type(arrow_type):
+    """
+    types_mapper for to_pandas: Arrow-backed columns, except the
+    dictionary encoded ones, which become pandas categories, and the
+    dates, which become datetime64[s] columns.
+    """
+    if pa.types.is_dictionary(arrow_type) or pa.types.is_timestamp(arrow_type):
+        return None
+
+    return pd.ArrowDtype(arrow_type)
 
 
 class DataExtractor:
@@ -21,11 +180,124 @@ class DataExtractor:
         
         self.db_path = db_path
 
-        #sqlite3 connection
-        self.conn = sqlite3.connect(db_path)
+        #read-only URI: no write locks, so several readers can run at once
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+
+        #sqlite3 connection (get_database_info, and the fallback when ADBC
+        #can't type a column: see SALES_SCHEMA)
+        #check_same_thread=False lets the extractor be used from a worker thread
+        self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        for pragma in SQLITE_PRAGMAS:
+            self.conn.execute(f"PRAGMA {pragma}")
+
+        #ADBC connection (Arrow-native, used by the extract_* methods)
+        #autocommit: the reads don't need a transaction, and some PRAGMAs
+        #can't run inside one
+        self.adbc_conn = adbc.connect(uri, autocommit=True)
+        cur = self.adbc_conn.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cur.execute(f"PRAGMA {pragma}")
+        cur.close()
+
+        #sales data kept after the first extraction (reused by the summaries)
+        self._sales_df = None
 
         print(f"Connected to the database: {db_path}")
 
+    def _query_to_arrow(self, query, schema):
+        """
+        Runs a query through ADBC and returns the result as an Arrow table
+        with the given schema (through sqlite3 if ADBC can't type a column).
+        """
+        cur = self.adbc_conn.cursor()
+        try:
+            cur.execute(query)
+            tbl = cur.fetch_arrow_table()
+        except OSError as e:
+            if not _is_type_mismatch(e):
+                raise
+            tbl = pa.Table.from_batches(self._sqlite_batches(query, schema, 100_000), schema)
+        finally:
+            cur.close()
+
+        return tbl.cast(schema)
+
+    def _query_to_batches(self, query, schema, batch_size):
+        """
+        Runs a query through ADBC and yields the result as Arrow record
+        batches of up to batch_size rows, without loading the whole result.
+        If ADBC can't type a column, the rest of the rows come from sqlite3
+        (the query must have a fixed row order).
+        """
+        cur = self.adbc_conn.cursor()
+        rows = 0
+        try:
+            cur.adbc_statement.set_options(
+                **{"adbc.sqlite.query.batch_rows": str(batch_size)}
+            )
+            cur.execute(query)
+            try:
+                for batch in cur.fetch_record_batch():
+                    rows += batch.num_rows
+                    yield batch.cast(schema)
+            except OSError as e:
+                if not _is_type_mismatch(e):
+                    raise
+                yield from self._sqlite_batches(query, schema, batch_size, skip=rows)
+        finally:
+            cur.close()
+
+    def _sqlite_batches(self, query, schema, batch_size, skip=0):
+        """
+        Runs a query through sqlite3 and yields the rows after the first
+        skip ones as Arrow record batches with the given schema.
+        Slower than ADBC (Python tuples), only used when it fails.
+        """
+        print("⚠️ ADBC could not type a column, reading through sqlite3")
+
+        cur = self.conn.cursor()
+        try:
+            cur.execute(query)
+            # rows already read through ADBC
+            while skip > 0 and (skipped := cur.fetchmany(min(skip, batch_size))):
+                skip -= len(skipped)
+            while rows := cur.fetchmany(batch_size):
+                columns = zip(*rows)
+                yield pa.RecordBatch.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                )
+        finally:
+            cur.close()
+
+    def _add_sales_calculations(self, tbl):
+        """
+        Adds Total and DiscountAmount to the sales table (or record batch).
+        Computed with Arrow's vectorized kernels instead of per row in SQLite.
+        """
+        gross = pc.multiply(tbl['Quantity'], tbl['UnitPrice'])
+
+        tbl = tbl.append_column('Total', pc.multiply(gross, pc.subtract(1.0, tbl['Discount'])))
+        tbl = tbl.append_column('DiscountAmount', pc.multiply(gross, tbl['Discount']))
+
+        return tbl
+
+    def _downcast_sales(self, tbl):
+        """
+        Casts the sales table (or record batch) to SALES_DTYPES and
+        dictionary encodes the SALES_CATEGORIES columns.
+        The casts are checked, so a value that doesn't fit raises an error.
+        """
+        for name, arrow_type in SALES_DTYPES.items():
+            i = tbl.schema.get_field_index(name)
+            tbl = tbl.set_column(i, name, pc.cast(tbl[name], arrow_type))
+
+        for name in SALES_CATEGORIES:
+            i = tbl.schema.get_field_index(name)
+            tbl = tbl.set_column(i, name, pc.dictionary_encode(tbl[name]))
+
+        return tbl
+
     def extract_sales_data(self):
         """
         Extract complete sales data joining multiple tables.
@@ -34,101 +306,76 @@ class DataExtractor:
         """
         print("Extracting sales data...")
 
-        query = """
-        SELECT
-            -- Order Data
-            o.OrderID,
-            o.OrderDate,
-            o.ShippedDate,
-            o.ShipCountry,
-            o.Freight,
-
-            -- Customers Data
-            c.CustomerID,
-            c.CompanyName,
-            c.ContactName,
-            c.Country AS CustomerCountry,
-            c.City AS CustomerCity,
-
-            -- Product Data
-            p.ProductID,
-            p.ProductName,
-            p.UnitPrice AS ProductUnitPrice,
-
-            -- Category Data
-            cat.CategoryID,
-            cat.CategoryName,
-            cat.Description AS CategoryDescription,
-
-            -- Supplier Data
-            s.CompanyName AS SupplierName,
-            s.Country AS SupplierCountry,
-
-            -- Order Detail Data
-            od.Quantity,
-            od.UnitPrice,
-            od.Discount,
-
-            -- Calculations
-            (od.Quantity * od.UnitPrice * (1 - od.Discount)) AS Total,
-            (od.Quantity * od.UnitPrice * od.Discount) AS DiscountAmount
-
-        From Orders o
-        INNER JOIN "Order Details" od ON o.OrderID = od.OrderID
-        INNER JOIN Products p ON od.ProductID = p.ProductID
-        INNER JOIN Categories cat ON p.CategoryID = cat.CategoryID
-        INNER JOIN Customers c ON o.CustomerID = c.CustomerID
-        INNER JOIN Suppliers s ON p.SupplierID = s.SupplierID
-
-        WHERE 
-            o.OrderDate IS NOT NULL
-            AND od.Quantity > 0
-            AND od.UnitPrice >= 0
-
-        ORDER BY o.OrderDate DESC;
-        
-        """
-        df = pd.read_sql_query(query , self.conn ) 
+        tbl = self._add_sales_calculations(self._query_to_arrow(SALES_QUERY, SALES_SCHEMA))
+        df = self._downcast_sales(tbl).to_pandas(types_mapper=_pandas_type)
         print(f"✅ {len(df):,} extracted registers!\n")
         print(f"Period: {df['OrderDate'].min()} until {df['OrderDate'].max()}")
 
+        self._sales_df = df
+
         return df
-    
-    def extract_customers_summary(self):
+
+    def stream_sales_data(self, batch_size=100_000):
         """
+        Extracts the same sales data as extract_sales_data, one batch at a time.
+        It's a generator of pandas dataframes with up to batch_size rows,
+        so the caller only holds one batch in memory.
 
-        Extracts an aggregated custommer summary.
-        Ex:
-        Customer A makes 5 orders = GROUP BY the 5 orders in 1 line
         """
-        print("Extracting customers summary...")
+        print(f"Streaming sales data (batches of {batch_size:,} rows)...")
 
-        query = """
-        SELECT 
-            c.CustomerID,
-            c.CompanyName,
-            c.Country,
-            c.City,
-            COUNT(DISTINCT o.OrderID) AS TotalOrders,
-            SUM(od.Quantity * od.UnitPrice * (1 - od.Discount)) AS TotalRevenue,
-            AVG(od.Quantity * od.UnitPrice * (1 - od.Discount)) AS AvgOrderValue,
-            MAX(o.OrderDate) AS LastOrderDate
+        total = 0
+        for batch in self._query_to_batches(SALES_QUERY, SALES_SCHEMA, batch_size):
+            batch = self._downcast_sales(self._add_sales_calculations(batch))
+            total += batch.num_rows
+            yield batch.to_pandas(types_mapper=_pandas_type)
 
-        FROM Customers c
-        LEFT JOIN Orders o ON c.CustomerID = o.CustomerID
-        LEFT JOIN "Order Details" od ON o.OrderID = od.OrderID
+        print(f"✅ {total:,} streamed registers!\n")
 
-        GROUP BY 
-            c.CustomerID, 
-            c.CompanyName, 
-            c.Country,
-            c.City
+    def _get_sales_data(self):
+        """
+        Returns the cached sales data, extracting it on the first call.
+        """
+        if self._sales_df is None:
+            self.extract_sales_data()
 
-        ORDER BY TotalRevenue DESC;
+        return self._sales_df
+    
+    def extract_customers_summary(self):
+        """
 
+        Extracts an aggregated custommer summary.
+        Ex:
+        Customer A makes 5 orders = GROUP BY the 5 orders in 1 line
 
+        Built from the cached sales data instead of a second join query,
+        so only customers with valid sales are listed. The aggregates
+        (TotalOrders, TotalRevenue, AvgOrderValue, LastOrderDate) also
+        cover only the lines kept by SALES_QUERY: lines with Quantity <= 0,
+        a negative UnitPrice, a non-positive total or an unparseable
+        OrderDate are not counted. This is intended, so the summary agrees
+        with the sales data and the reports built from it.
+        Customers with a NULL name, country or city are kept (as a
+        NaN group key), like the SQL GROUP BY did.
         """
-        df = pd.read_sql_query(query, self.conn)
+        print("Extracting customers summary...")
+
+        sales = self._get_sales_data()
+
+        df = sales.groupby(
+            ['CustomerID', 'CompanyName', 'CustomerCountry', 'CustomerCity'],
+            sort=False,
+            observed=True,
+            dropna=False
+        ).agg(
+            TotalOrders=('OrderID', 'nunique'),
+            TotalRevenue=('Total', 'sum'),
+            AvgOrderValue=('Total', 'mean'),
+            LastOrderDate=('OrderDate', 'max')
+        ).reset_index()
+
+        df = df.rename(columns={'CustomerCountry': 'Country', 'CustomerCity': 'City'})
+        df = df.sort_values('TotalRevenue', ascending=False, ignore_index=True)
     
         print(f"✅ {len(df)} extracted clients!")
     
@@ -137,35 +384,31 @@ class DataExtractor:
     def extract_products_summary(self):
         """
         Extracts the products summary (sales, quantity, Revenue)
+
+        Built from the cached sales data instead of a second join query,
+        so only products with valid sales are listed. As in
+        extract_customers_summary, the aggregates (TimesOrdered,
+        TotalUnitsSold, TotalRevenue, AvgSellingPrice) only count the lines
+        kept by SALES_QUERY, on purpose. Products with a NULL name,
+        category or supplier are kept, as in extract_customers_summary.
         """
         print("Extracting product summary!")
 
-        query = """
-        SELECT 
-            p.ProductID,
-            p.ProductName,
-            cat.CategoryName,
-            s.CompanyName AS SupplierName,
-            COUNT(DISTINCT o.OrderID) AS TimesOrdered,
-            SUM(od.Quantity) AS TotalUnitsSold,
-            SUM(od.Quantity * od.UnitPrice * (1 - od.Discount)) AS TotalRevenue,
-            AVG(od.UnitPrice) AS AvgSellingPrice
-        
-        FROM Products p
-        INNER JOIN Categories cat ON p.CategoryID = cat.CategoryID
-        INNER JOIN Suppliers s ON p.SupplierID = s.SupplierID
-        LEFT JOIN "Order Details" od ON p.ProductID = od.ProductID
-        LEFT JOIN Orders o ON od.OrderID = o.OrderID
-        
-        GROUP BY 
-            p.ProductID,
-            p.ProductName,
-            cat.CategoryName,
-            s.CompanyName
+        sales = self._get_sales_data()
 
-        ORDER BY TotalRevenue DESC;
-        """
-        df = pd.read_sql_query(query, self.conn)
+        df = sales.groupby(
+            ['ProductID', 'ProductName', 'CategoryName', 'SupplierName'],
+            sort=False,
+            observed=True,
+            dropna=False
+        ).agg(
+            TimesOrdered=('OrderID', 'nunique'),
+            TotalUnitsSold=('Quantity', 'sum'),
+            TotalRevenue=('Total', 'sum'),
+            AvgSellingPrice=('UnitPrice', 'mean')
+        ).reset_index()
+
+        df = df.sort_values('TotalRevenue', ascending=False, ignore_index=True)
 
         print(f"✅ {len(df)} products extracted")
     
@@ -186,19 +429,27 @@ class DataExtractor:
         SELECT name 
         FROM sqlite_master 
         WHERE type='table'
+        -- internal tables (sqlite_stat1 from ANALYZE in setup_database.py)
+        AND name NOT LIKE 'sqlite_%'
         ORDER BY name
         """
         
         tables = pd.read_sql_query(query_tables, self.conn)
         
+        # Counts the registers of all tables in a single query
+        # ASPAS DUPLAS ao redor de {table} para lidar com espaços
+        counts = {}
+        if len(tables) > 0:
+            count_query = " UNION ALL ".join(
+                'SELECT ? AS name, COUNT(*) AS count FROM "{}"'.format(table.replace('"', '""'))
+                for table in tables['name']
+            )
+            counts = dict(self.conn.execute(count_query, list(tables['name'])).fetchall())
+
         print(f"\n📁 Total of tables: {len(tables)}")
         print("\nAvailable Tables:")
         for idx, table in enumerate(tables['name'], 1):
-            # Counts the registers in each table
-            # ASPAS DUPLAS ao redor de {table} para lidar com espaços
-            count_query = f'SELECT COUNT(*) as count FROM "{table}"'
-            count = pd.read_sql_query(count_query, self.conn)['count'][0]
-            print(f"  {idx}. {table:20s} - {count:,} registers")
+            print(f"  {idx}. {table:20s} - {counts[table]:,} registers")
         
         print("="*60 + "\n")
     
@@ -208,6 +459,8 @@ class DataExtractor:
         Closes the connection with the database!
         
         """
+        self._sales_df = None
+        self.adbc_conn.close()
         self.conn.close()
         print("🔒 Connection with db closed!")
     
@@ -4,13 +4,19 @@
 Module responsible for LOADING processed data.
 
 It does:
-- Saves data in different formats (CSV, Excel)
+- Saves data in different formats (Parquet, CSV, Excel)
 - Creates summary reports
 - Exports aggregated metrics
 """
 
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+import xlsxwriter
 import os
+import shutil
 from datetime import datetime
 
 
@@ -19,6 +25,29 @@ class DataLoader:
     Class responsible for loading/saving processed data.
     """
     
+    # Columns read by create_complete_report
+    REPORT_COLUMNS = [
+        'OrderID', 'OrderDate', 'YearMonth',
+        'CustomerID', 'CompanyName',
+        'ProductID', 'ProductName', 'CategoryName',
+        'Quantity', 'Total', 'DiscountAmount'
+    ]
+    
+    # Shared by every save_to_csv call
+    CSV_WRITE_OPTIONS = pacsv.WriteOptions(include_header=True)
+    
+    # Display format of each summary metric (used by format_summary)
+    SUMMARY_FORMATS = {
+        'Total Revenue': '${:,.2f}',
+        'Number of Orders': '{:,}',
+        'Number of Customers': '{:,}',
+        'Number of Products': '{:,}',
+        'Average Order Value': '${:,.2f}',
+        'Average Items per Order': '{:.2f}',
+        'Total Units Sold': '{:,}',
+        'Date Range': '{:%Y-%m-%d} to {:%Y-%m-%d}'
+    }
+    
     def __init__(self, output_dir='data/processed'):
         """
         Initializes with output directory.
@@ -43,10 +72,21 @@ class DataLoader:
         - Universal format
         - Opens in Excel, Python, R, etc
         - Lightweight
+        
+        Written by pyarrow's multithreaded CSV writer (UTF-8)
+        instead of df.to_csv.
         """
         filepath = os.path.join(self.output_dir, filename)
         
-        df.to_csv(filepath, index=False, encoding='utf-8')
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        
+        # Dates are written in seconds ("2024-01-31 00:00:00"),
+        # not with the nanosecond digits
+        for i, field in enumerate(table.schema):
+            if pa.types.is_timestamp(field.type):
+                table = table.set_column(i, field.name, table[field.name].cast(pa.timestamp('s'), safe=False))
+        
+        pacsv.write_csv(table, filepath, write_options=self.CSV_WRITE_OPTIONS)
         
         file_size = os.path.getsize(filepath) / (1024 * 1024)  # MB
         print(f"💾 CSV saved: {filepath} ({file_size:.2f} MB)")
@@ -54,6 +94,99 @@ class DataLoader:
         return filepath
     
     
+    def save_to_parquet(self, df, filename):
+        """
+        Saves DataFrame to Parquet.
+        
+        Parquet = columnar binary format
+        - Compressed (zstd) and much smaller than CSV
+        - Keeps the column types (dates, categories)
+        - Readers can load only the columns they need
+        """
+        filepath = os.path.join(self.output_dir, filename)
+        
+        # Removes the old file first: it may be hard linked to a versioned
+        # copy, and writing over it would change that copy too
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(
+            table,
+            filepath,
+            compression='zstd',
+            use_dictionary=True,
+            row_group_size=128_000
+        )
+        
+        file_size = os.path.getsize(filepath) / (1024 * 1024)  # MB
+        print(f"💾 Parquet saved: {filepath} ({file_size:.2f} MB)")
+        
+        return filepath
+    
+    
+    def save_batches_to_parquet(self, batches, filename):
+        """
+        Saves DataFrame batches to a single Parquet file.
+        
+        Each batch is written as soon as it arrives, so only one batch
+        is held in memory. All batches must have the same columns.
+        
+        Returns None (and writes no file) when there are no batches.
+        """
+        filepath = os.path.join(self.output_dir, filename)
+        
+        # Same reason as in save_to_parquet (hard linked versioned copies)
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        
+        writer = None
+        rows = 0
+        try:
+            for df in batches:
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        filepath,
+                        self._batch_schema(df),
+                        compression='zstd',
+                        use_dictionary=True
+                    )
+                # Keeps every batch on the schema of the first one
+                table = pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False)
+                writer.write_table(table, row_group_size=128_000)
+                rows += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        if writer is None:
+            print(f"⚠️ No batches to save: {filepath} not written")
+            return None
+        
+        file_size = os.path.getsize(filepath) / (1024 * 1024)  # MB
+        print(f"💾 Parquet saved: {filepath} ({rows:,} records, {file_size:.2f} MB)")
+        
+        return filepath
+    
+    
+    def _batch_schema(self, df):
+        """
+        Returns the Arrow schema of a batch, for save_batches_to_parquet.
+        
+        A categorical gets the smallest int type for its codes (int8 with
+        fewer than 128 categories), so a later batch with more categories
+        would not fit: the dictionary indices are widened to int32.
+        """
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        
+        for i, field in enumerate(schema):
+            if pa.types.is_dictionary(field.type):
+                index_type = pa.dictionary(pa.int32(), field.type.value_type, field.type.ordered)
+                schema = schema.set(i, field.with_type(index_type))
+        
+        return schema
+    
+    
     def save_to_excel(self, dataframes_dict, filename):
         """
         Saves multiple DataFrames to Excel (multiple sheets).
@@ -74,9 +207,18 @@ class DataLoader:
         """
         filepath = os.path.join(self.output_dir, filename)
         
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        # constant_memory: xlsxwriter flushes each row to disk when the
+        # next one starts, instead of keeping the whole workbook in memory
+        workbook = xlsxwriter.Workbook(filepath, {'constant_memory': True})
+        formats = {
+            'header': workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}),
+            'date': workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+        }
+        try:
             for sheet_name, df in dataframes_dict.items():
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
+                self._write_excel_sheet(workbook.add_worksheet(sheet_name), df, formats)
+        finally:
+            workbook.close()
         
         file_size = os.path.getsize(filepath) / (1024 * 1024)  # MB
         print(f"💾 Excel saved: {filepath} ({file_size:.2f} MB)")
@@ -85,53 +227,124 @@ class DataLoader:
         return filepath
     
     
-    def create_summary_report(self, df):
+    def _write_excel_sheet(self, worksheet, df, formats):
         """
-        Creates summary report with key metrics.
+        Writes one DataFrame to an empty worksheet, row by row.
         
-        Returns:
-        --------
-        DataFrame with aggregated metrics
+        In constant_memory mode a row can't be changed once the next one
+        is started, and df.to_excel writes column by column, so the cells
+        are written here instead (same layout: bold header, no index).
         """
-        print("📊 Generating summary report...")
-        
-        summary = {
-            'Metric': [],
-            'Value': []
-        }
-        
-        # General metrics
-        summary['Metric'].append('Total Revenue')
-        summary['Value'].append(f"${df['Total'].sum():,.2f}")
+        worksheet.write_row(0, 0, [str(col) for col in df.columns], formats['header'])
+        
+        for row, values in enumerate(df.itertuples(index=False, name=None), start=1):
+            for col, value in enumerate(values):
+                # Missing values stay as empty cells
+                if pd.api.types.is_scalar(value) and pd.isna(value):
+                    continue
+                if isinstance(value, datetime):
+                    worksheet.write_datetime(row, col, value, formats['date'])
+                else:
+                    worksheet.write(row, col, value)
+    
+    
+    def create_order_totals(self, df):
+        """
+        Aggregates the sales lines to one row per order.
         
-        summary['Metric'].append('Number of Orders')
-        summary['Value'].append(f"{df['OrderID'].nunique():,}")
+        Order level columns (date, customer) are the same on every line
+        of an order, so the summary, the monthly analysis and the customer
+        ranking can all be computed from this much smaller frame.
         
-        summary['Metric'].append('Number of Customers')
-        summary['Value'].append(f"{df['CustomerID'].nunique():,}")
+        Returns:
+        --------
+        DataFrame indexed by OrderID
+        """
+        per_order = df.groupby('OrderID', sort=False, observed=True).agg(
+            Total=('Total', 'sum'),
+            Quantity=('Quantity', 'sum'),
+            YearMonth=('YearMonth', 'first'),
+            CustomerID=('CustomerID', 'first'),
+            CompanyName=('CompanyName', 'first'),
+            OrderDate=('OrderDate', 'max')
+        )
+        
+        return per_order
+    
+    
+    def create_summary_report(self, df, per_order=None):
+        """
+        Creates summary report with key metrics.
         
-        summary['Metric'].append('Number of Products')
-        summary['Value'].append(f"{df['ProductID'].nunique():,}")
+        Parameters:
+        -----------
+        per_order : DataFrame, optional
+            Result of create_order_totals (computed if not given)
         
-        summary['Metric'].append('Average Order Value')
-        summary['Value'].append(f"${df.groupby('OrderID')['Total'].sum().mean():,.2f}")
+        Returns:
+        --------
+        DataFrame with aggregated metrics
         
-        summary['Metric'].append('Average Items per Order')
-        summary['Value'].append(f"{df.groupby('OrderID')['Quantity'].sum().mean():.2f}")
+        The values are kept as numbers (and a (first, last) pair of dates
+        for Date Range); format_summary turns them into display strings.
+        """
+        print("📊 Generating summary report...")
         
-        summary['Metric'].append('Total Units Sold')
-        summary['Value'].append(f"{df['Quantity'].sum():,}")
+        if per_order is None:
+            per_order = self.create_order_totals(df)
         
-        summary['Metric'].append('Date Range')
         # Converte para datetime primeiro (caso seja string)
-        date_col = pd.to_datetime(df['OrderDate'])
-        summary['Value'].append(f"{date_col.min().date()} to {date_col.max().date()}")
-        
-        summary_df = pd.DataFrame(summary)
-        
-        print(f"✅ Summary created with {len(summary_df)} metrics")
-        
-        return summary_df
+        date_col = pd.to_datetime(per_order['OrderDate'])
+        
+        # Every metric but the product count comes from the order totals
+        summary = pd.DataFrame({
+            'Metric': [
+                'Total Revenue',
+                'Number of Orders',
+                'Number of Customers',
+                'Number of Products',
+                'Average Order Value',
+                'Average Items per Order',
+                'Total Units Sold',
+                'Date Range'
+            ],
+            'Value': np.array([
+                per_order['Total'].sum(),
+                len(per_order),
+                per_order['CustomerID'].nunique(),
+                df['ProductID'].nunique(),
+                per_order['Total'].mean(),
+                per_order['Quantity'].mean(),
+                per_order['Quantity'].sum(),
+                (date_col.min(), date_col.max())
+            ], dtype=object)
+        })
+        
+        print(f"✅ Summary created with {len(summary)} metrics")
+        
+        return summary
+    
+    
+    def format_summary(self, summary_df):
+        """
+        Returns a copy of the summary report with the values formatted
+        for display (e.g. "$1,234.56"), using SUMMARY_FORMATS.
+        """
+        formatted = summary_df.copy()
+        
+        values = []
+        for metric, value in zip(summary_df['Metric'], summary_df['Value']):
+            fmt = self.SUMMARY_FORMATS.get(metric, '{}')
+            if not isinstance(value, tuple):
+                values.append(fmt.format(value))
+            elif any(pd.isna(v) for v in value):
+                # No sales: the dates are NaT, which has no strftime
+                values.append(' to '.join(str(v) for v in value))
+            else:
+                values.append(fmt.format(*value))
+        formatted['Value'] = values
+        
+        return formatted
     
     
     def create_category_analysis(self, df):
@@ -140,7 +353,7 @@ class DataLoader:
         """
         print("📦 Analyzing categories...")
         
-        category_stats = df.groupby('CategoryName').agg({
+        category_stats = df.groupby('CategoryName', observed=True).agg({
             'OrderID': 'nunique',
             'Quantity': 'sum',
             'Total': 'sum',
@@ -162,23 +375,36 @@ class DataLoader:
         return category_stats
     
     
-    def create_monthly_analysis(self, df):
+    def create_monthly_analysis(self, df, per_order=None):
         """
         Creates monthly sales analysis.
+        
+        Every order falls in a single month, so the order totals are
+        grouped instead of the sales lines.
         """
         print("📅 Analyzing monthly trends...")
         
-        monthly_stats = df.groupby('YearMonth').agg({
-            'OrderID': 'nunique',
-            'Total': 'sum',
-            'Quantity': 'sum'
-        }).reset_index()
+        if per_order is None:
+            per_order = self.create_order_totals(df)
+        
+        monthly_stats = per_order.groupby('YearMonth', observed=True).agg(
+            Orders=('Total', 'size'),
+            Revenue=('Total', 'sum'),
+            Units=('Quantity', 'sum')
+        ).reset_index()
         
         monthly_stats.columns = ['Month', 'Orders', 'Revenue', 'Units Sold']
         
         # Sorts by month
         monthly_stats = monthly_stats.sort_values('Month')
         
+        # YearMonth is an int key (YYYYMM): formatted as "YYYY-MM" for the report
+        if pd.api.types.is_integer_dtype(monthly_stats['Month']):
+            month = monthly_stats['Month']
+            monthly_stats['Month'] = (
+                (month // 100).astype(str) + '-' + (month % 100).astype(str).str.zfill(2)
+            )
+        
         print(f"✅ {len(monthly_stats)} months analyzed")
         
         return monthly_stats
@@ -190,7 +416,7 @@ class DataLoader:
         """
         print(f"🏆 Finding top {top_n} products...")
         
-        product_stats = df.groupby('ProductName').agg({
+        product_stats = df.groupby('ProductName', observed=True).agg({
             'OrderID': 'nunique',
             'Quantity': 'sum',
             'Total': 'sum'
@@ -206,17 +432,23 @@ class DataLoader:
         return top_products
     
     
-    def create_top_customers(self, df, top_n=20):
+    def create_top_customers(self, df, top_n=20, per_order=None):
         """
         Creates ranking of top customers.
+        
+        Every order belongs to a single customer, so the order totals are
+        grouped instead of the sales lines.
         """
         print(f"👥 Finding top {top_n} customers...")
         
-        customer_stats = df.groupby(['CustomerID', 'CompanyName']).agg({
-            'OrderID': 'nunique',
-            'Total': 'sum',
-            'OrderDate': 'max'
-        }).reset_index()
+        if per_order is None:
+            per_order = self.create_order_totals(df)
+        
+        customer_stats = per_order.groupby(['CustomerID', 'CompanyName'], observed=True).agg(
+            Orders=('Total', 'size'),
+            Revenue=('Total', 'sum'),
+            LastOrder=('OrderDate', 'max')
+        ).reset_index()
         
         customer_stats.columns = ['CustomerID', 'Company', 'Orders', 'Revenue', 'Last Order']
         
@@ -232,6 +464,10 @@ class DataLoader:
         """
         Creates complete report with multiple analyses.
         
+        The sales lines are aggregated per order only once, and that
+        result is shared by the summary, monthly and customer analyses.
+        OrderID is converted to a category once for all the analyses.
+        
         Returns:
         --------
         dict with multiple DataFrames
@@ -240,13 +476,21 @@ class DataLoader:
         print("📊 CREATING COMPLETE REPORT")
         print("="*60 + "\n")
         
+        # OrderID as a category: the order totals and the nunique counts
+        # in the category/product analyses reuse its codes instead of
+        # hashing the IDs again (shallow copy, the caller's frame is kept)
+        df = df.copy(deep=False)
+        df['OrderID'] = df['OrderID'].astype('category')
+        
+        per_order = self.create_order_totals(df)
+        
         report = {}
         
-        report['Summary'] = self.create_summary_report(df)
+        report['Summary'] = self.create_summary_report(df, per_order=per_order)
         report['Categories'] = self.create_category_analysis(df)
-        report['Monthly'] = self.create_monthly_analysis(df)
+        report['Monthly'] = self.create_monthly_analysis(df, per_order=per_order)
         report['Top Products'] = self.create_top_products(df)
-        report['Top Customers'] = self.create_top_customers(df)
+        report['Top Customers'] = self.create_top_customers(df, per_order=per_order)
         
         print("\n✅ Complete report created with 5 analyses")
         
@@ -255,7 +499,7 @@ class DataLoader:
     
     def save_complete_output(self, df):
         """
-        Saves all outputs (CSV + Excel with reports).
+        Saves all outputs (Parquet + Excel with reports).
         
         This is the main method to use in the pipeline.
         """
@@ -263,30 +507,73 @@ class DataLoader:
         print("💾 SAVING ALL OUTPUTS")
         print("="*60 + "\n")
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # 1. Saves complete data in Parquet
+        print("--- Saving complete data ---")
+        primary = self.save_to_parquet(df, 'sales_complete.parquet')
         
-        # 1. Saves complete data in CSV
+        self._save_reports_and_backup(df, primary)
+    
+    
+    def save_streamed_output(self, batches):
+        """
+        Saves all outputs from an iterable of DataFrame batches.
+        
+        Same files as save_complete_output, but the complete data is
+        written batch by batch and then only the report columns are
+        read back from the Parquet file to build the reports.
+        """
+        print("\n" + "="*60)
+        print("💾 SAVING ALL OUTPUTS (STREAMING)")
+        print("="*60 + "\n")
+        
+        # 1. Saves complete data in Parquet, one batch at a time
         print("--- Saving complete data ---")
-        self.save_to_csv(df, 'sales_complete.csv')
+        primary = self.save_batches_to_parquet(batches, 'sales_complete.parquet')
+        if primary is None:
+            print("⚠️ No sales data: reports not created")
+            return
+        
+        df_report = pd.read_parquet(primary, columns=self.REPORT_COLUMNS)
+        
+        self._save_reports_and_backup(df_report, primary)
+    
+    
+    def _save_reports_and_backup(self, df, primary):
+        """
+        Creates the Excel reports and the versioned copy of the
+        complete data (steps 2 and 3 of save_complete_output).
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         # 2. Creates and saves reports in Excel
         print("\n--- Creating reports ---")
         reports = self.create_complete_report(df)
         
         print("\n--- Saving reports to Excel ---")
+        reports['Summary'] = self.format_summary(reports['Summary'])
         self.save_to_excel(reports, 'sales_reports.xlsx')
         
         # 3. Also saves a version with timestamp (history)
+        # Hard link to the primary file: same bytes, no second encoding
+        # (plain file copy where hard links aren't supported)
         print("\n--- Saving versioned copy ---")
-        self.save_to_csv(df, f'sales_complete_{timestamp}.csv')
+        versioned = os.path.join(self.output_dir, f'sales_complete_{timestamp}.parquet')
+        try:
+            os.link(primary, versioned)
+            action = "linked"
+        except OSError:
+            shutil.copyfile(primary, versioned)
+            action = "copied"
+        file_size = os.path.getsize(versioned) / (1024 * 1024)  # MB
+        print(f"🔗 Versioned copy {action}: {versioned} ({file_size:.2f} MB)")
         
         print("\n" + "="*60)
         print("✅ ALL OUTPUTS SAVED SUCCESSFULLY")
         print("="*60)
         print(f"\n📂 Files created in: {self.output_dir}/")
-        print("  ➜ sales_complete.csv (full data)")
+        print("  ➜ sales_complete.parquet (full data)")
         print("  ➜ sales_reports.xlsx (5 analysis sheets)")
-        print(f"  ➜ sales_complete_{timestamp}.csv (versioned backup)")
+        print(f"  ➜ sales_complete_{timestamp}.parquet (versioned backup)")
         print("")
 
 
@@ -299,7 +586,11 @@ if __name__ == "__main__":
     
     # Loads transformed data
     print("--- Loading transformed data ---")
-    df = pd.read_csv('data/processed/sales_transformed.csv')
+    # Parquet from the transform module test (CSV if it ran with --csv)
+    if os.path.exists('data/processed/sales_transformed.parquet'):
+        df = pd.read_parquet('data/processed/sales_transformed.parquet')
+    else:
+        df = pd.read_csv('data/processed/sales_transformed.csv')
     print(f"✅ Loaded {len(df):,} records")
     
     # Creates loader
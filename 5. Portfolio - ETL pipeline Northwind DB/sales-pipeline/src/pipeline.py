@@ -13,6 +13,7 @@ Date: 02/2026
 """
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from extract import DataExtractor
 from transform import DataTransformer
@@ -32,7 +33,7 @@ def print_step(step_num, total_steps, description):
     print("-" * 70)
 
 
-def run_etl_pipeline(db_path='data/raw/northwind.db', output_dir='data/processed'):
+def run_etl_pipeline(db_path='data/raw/northwind.db', output_dir='data/processed', backend='pandas'):
     """
     Runs the complete ETL pipeline.
     
@@ -42,6 +43,8 @@ def run_etl_pipeline(db_path='data/raw/northwind.db', output_dir='data/processed
         Path to the SQLite database
     output_dir : str
         Directory to save processed data
+    backend : str
+        Transformation engine: 'pandas' or 'polars' (see DataTransformer)
     
     Returns:
     --------
@@ -66,6 +69,10 @@ def run_etl_pipeline(db_path='data/raw/northwind.db', output_dir='data/processed
         # ========== STEP 1: EXTRACT ==========
         print_step(1, 3, "📥 EXTRACT - Extracting data from database")
         
+        # Set up first, so a missing backend fails before the extraction.
+        # inplace: the pipeline owns the extracted frame, no copies needed
+        transformer = DataTransformer(backend=backend, inplace=True)
+        
         extractor = DataExtractor(db_path)
         df_raw = extractor.extract_sales_data()
         extractor.close()
@@ -80,19 +87,22 @@ def run_etl_pipeline(db_path='data/raw/northwind.db', output_dir='data/processed
         # ========== STEP 2: TRANSFORM ==========
         print_step(2, 3, "🔄 TRANSFORM - Cleaning and engineering features")
         
-        transformer = DataTransformer()
-        
-        # 2.1 Cleaning
-        print("\n➤ Cleaning data...")
-        df_clean = transformer.clean_sales_data(df_raw)
-        
-        # 2.2 Temporal features
-        print("\n➤ Creating temporal features...")
-        df_time = transformer.create_time_features(df_clean)
-        
-        # 2.3 Business features
-        print("\n➤ Creating business features...")
-        df_final = transformer.create_business_features(df_time)
+        if backend == 'polars':
+            # 2.1 Cleaning, then 2.2-2.3 features in a single Polars query
+            print("\n➤ Cleaning data and creating features...")
+            df_final = transformer.transform_sales_data(df_raw)
+        else:
+            # 2.1 Cleaning
+            print("\n➤ Cleaning data...")
+            df_clean = transformer.clean_sales_data(df_raw)
+            
+            # 2.2 Temporal features
+            print("\n➤ Creating temporal features...")
+            df_time = transformer.create_time_features(df_clean)
+            
+            # 2.3 Business features
+            print("\n➤ Creating business features...")
+            df_final = transformer.create_business_features(df_time)
         
         # 2.4 Quality report
         print("\n➤ Generating quality report...")
@@ -135,13 +145,13 @@ def run_etl_pipeline(db_path='data/raw/northwind.db', output_dir='data/processed
         print(f"   Records processed: {pipeline_stats['clean_records']:,}")
         print(f"   Features created: {pipeline_stats['features_created']}")
         print(f"\n📂 Output files in: {output_dir}/")
-        print(f"   ➜ sales_complete.csv")
+        print(f"   ➜ sales_complete.parquet")
         print(f"   ➜ sales_reports.xlsx")
-        print(f"   ➜ sales_complete_[timestamp].csv")
+        print(f"   ➜ sales_complete_[timestamp].parquet")
         
         print("\n💡 Next steps:")
         print("   1. Open sales_reports.xlsx to view analyses")
-        print("   2. Use sales_complete.csv for further analysis")
+        print("   2. Use sales_complete.parquet for further analysis")
         print("   3. Check notebooks/ for exploratory analysis")
         
         return pipeline_stats
@@ -193,6 +203,71 @@ def run_quick_test():
     print(f"📂 Test outputs in: data/processed/test/")
 
 
+def prefetch_batches(batches):
+    """
+    Yields the batches of an iterator, reading the next one on a worker
+    thread while the current one is processed (the ADBC reads happen in
+    native code, so both run at the same time).
+    """
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(next, batches, None)
+            while (batch := future.result()) is not None:
+                future = pool.submit(next, batches, None)
+                yield batch
+    finally:
+        # Closes the query's cursor if the batches were not all read
+        batches.close()
+
+
+def run_streaming_pipeline(db_path='data/raw/northwind.db', output_dir='data/processed', batch_size=100_000):
+    """
+    Runs the ETL pipeline one batch at a time.
+    
+    Each batch of extracted rows is cleaned, gets its features and is
+    appended to the Parquet output while the next batch is read, so the
+    memory peak (two batches) depends on batch_size instead of the number
+    of records.
+    The reports are built afterwards from the report columns only.
+    (The data quality report needs the full data, so it is skipped.)
+    
+    Parameters:
+    -----------
+    batch_size : int
+        Number of records per batch
+    """
+    
+    print_header("🌊 STREAMING ETL PIPELINE - Processing batches")
+    
+    start_time = time.time()
+    
+    extractor = DataExtractor(db_path)
+    # Not verbose: the transformer runs once per batch
+    # (and each batch is a new frame, so it's changed in place)
+    transformer = DataTransformer(verbose=False, inplace=True)
+    loader = DataLoader(output_dir=output_dir)
+    
+    def transformed_batches():
+        # Extract → Transform for one batch (all transformations are row by row),
+        # the next batch is extracted in the meantime
+        for df_raw in prefetch_batches(extractor.stream_sales_data(batch_size)):
+            df_clean = transformer.clean_sales_data(df_raw)
+            df_time = transformer.create_time_features(df_clean)
+            yield transformer.create_business_features(df_time)
+    
+    try:
+        # Load (consumes the batches as they are produced)
+        loader.save_streamed_output(transformed_batches())
+    finally:
+        extractor.close()
+    
+    elapsed_time = time.time() - start_time
+    
+    print_header("✅ STREAMING PIPELINE COMPLETED")
+    print(f"⏱️ Duration: {int(elapsed_time // 60)}m {int(elapsed_time % 60)}s")
+    print(f"📂 Outputs in: {output_dir}/")
+
+
 # ========== MAIN EXECUTION ==========
 if __name__ == "__main__":
     
@@ -202,9 +277,13 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == '--test':
         # Run quick test
         run_quick_test()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--stream':
+        # Run pipeline in batches (bounded memory)
+        run_streaming_pipeline()
     else:
-        # Run full pipeline
-        stats = run_etl_pipeline()
+        # Run full pipeline (--polars: transformations with Polars)
+        backend = 'polars' if '--polars' in sys.argv[1:] else 'pandas'
+        stats = run_etl_pipeline(backend=backend)
         
         # Optionally save stats
         import json
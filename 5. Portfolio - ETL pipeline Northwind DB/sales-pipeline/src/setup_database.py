@@ -1,6 +1,56 @@
 import urllib.request
+import sqlite3
 import os
 
+# Foreign keys used by the sales JOINs in extract.py
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_od_productid ON "Order Details"(ProductID)',
+    'CREATE INDEX IF NOT EXISTS idx_od_orderid ON "Order Details"(OrderID)',
+    'CREATE INDEX IF NOT EXISTS idx_products_categoryid ON Products(CategoryID)',
+    'CREATE INDEX IF NOT EXISTS idx_products_supplierid ON Products(SupplierID)',
+    'CREATE INDEX IF NOT EXISTS idx_orders_customerid ON Orders(CustomerID)',
+]
+
+# Larger pages: shallower B-trees for the tables the JOINs walk
+PAGE_SIZE = 8192
+
+def prepare_database(destination):
+    """
+    Creates the foreign key indexes, updates the planner statistics
+    and switches the journal to WAL.
+    If the file doesn't use PAGE_SIZE pages yet, it is rebuilt with
+    them (VACUUM) first.
+
+    Newer SQLite versions are less eager to build automatic indexes for
+    joins, so the sales query could fall back to full scans without them.
+    The journal mode is stored in the file, and the extractor opens the
+    database read-only, so it has to be set here.
+    """
+    print("Creating indexes...")
+
+    conn = sqlite3.connect(destination)
+    try:
+        script = ""
+
+        #the page size can't change in WAL mode, and only applies after a VACUUM
+        if conn.execute("PRAGMA page_size").fetchone()[0] != PAGE_SIZE:
+            script += f"PRAGMA journal_mode=DELETE; PRAGMA page_size={PAGE_SIZE}; VACUUM;\n"
+
+        #all the indexes in one transaction: a single commit (and fsync)
+        script += "BEGIN;\n" + "".join(f"{statement};\n" for statement in INDEXES) + "COMMIT;\n"
+
+        #fills sqlite_stat1 so the planner picks the right join order
+        script += "ANALYZE;\n"
+
+        #WAL: readers don't block each other (or a writer)
+        script += "PRAGMA journal_mode=WAL;"
+
+        conn.executescript(script)
+    finally:
+        conn.close()
+
+    print(f"{len(INDEXES)} indexes ready")
+
 def download_database():
     """
     Downloads the NorthWind Database
@@ -11,6 +61,7 @@ def download_database():
 
     if os.path.exists(destination):
         print(f"Database already exists in: {destination}")
+        prepare_database(destination)
         return
     
     print("Downloading the Northwind Database...")
@@ -22,6 +73,8 @@ def download_database():
         #verifies the file size
         file_size = os.path.getsize(destination) / (1024 * 1024) #in MB
         print(f"File size : {file_size:.2f} MB")
+
+        prepare_database(destination)
     except Exception as e:
         print(f"Error in downloading : {e}")
 if __name__ == "__main__":
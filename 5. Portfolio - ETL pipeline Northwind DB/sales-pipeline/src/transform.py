@@ -9,8 +9,79 @@ It does:
 - Validates data quality
 """
 
+import logging
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# Numba is optional: without it the business features use the numpy path
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Polars is optional too (only needed for backend='polars')
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+
+if numba is not None:
+    
+    # Compiled when the module is imported (the signature is given),
+    # cached on disk, and run in parallel over the rows
+    @numba.guvectorize(
+        [(numba.float64, numba.float64, numba.float64, numba.float64,
+          numba.int8[:], numba.int8[:], numba.int8[:], numba.float64[:])],
+        '(),(),(),()->(),(),(),()',
+        target='parallel',
+        cache=True
+    )
+    def _business_features(discount, total, quantity, delivery_days,
+                           has_discount, discount_level, delivery_speed, revenue_per_unit):
+        """
+        Computes HasDiscount, the DiscountLevel and DeliverySpeed codes
+        and RevenuePerUnit for one row: every input column is read once.
+        RevenuePerUnit is NaN when the quantity is 0.
+        
+        The ladders match the pandas bins (right-closed), with -1 for a
+        discount outside (-0.01, 1] and for orders not shipped (NaN days).
+        """
+        d = discount
+        
+        has_discount[0] = 1 if d > 0 else 0
+        
+        if not (d > -0.01 and d <= 1):
+            discount_level[0] = -1
+        elif d <= 0:
+            discount_level[0] = 0
+        elif d <= 0.05:
+            discount_level[0] = 1
+        elif d <= 0.15:
+            discount_level[0] = 2
+        elif d <= 0.25:
+            discount_level[0] = 3
+        else:
+            discount_level[0] = 4
+        
+        days = delivery_days
+        
+        if not (days > -1):
+            delivery_speed[0] = -1
+        elif days <= 3:
+            delivery_speed[0] = 0
+        elif days <= 7:
+            delivery_speed[0] = 1
+        elif days <= 14:
+            delivery_speed[0] = 2
+        else:
+            delivery_speed[0] = 3
+        
+        # NaN for a zero quantity (no division by zero)
+        revenue_per_unit[0] = total / quantity if quantity != 0 else np.nan
 
 
 class DataTransformer:
@@ -18,19 +89,174 @@ class DataTransformer:
     Class responsible for transforming and cleaning data.
     """
     
-    def __init__(self):
-        """Simple initializer (no parameters needed)"""
-        pass
+    # Labels of the categorical features (shared by both backends)
+    MONTH_NAMES = [
+        'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+        'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'
+    ]
+    DAY_NAMES = [
+        'Monday', 'Tuesday', 'Wednesday', 'Thursday',
+        'Friday', 'Saturday', 'Sunday'
+    ]
+    ORDER_SIZE_LABELS = ['Very Small', 'Small', 'Medium', 'Large', 'VIP']
+    DISCOUNT_LEVEL_LABELS = ['No Discount', 'Low', 'Medium', 'High', 'Very High']
+    DELIVERY_SPEED_LABELS = ['Express', 'Fast', 'Normal', 'Slow']
+    
+    # Text columns used as group keys downstream, kept as categories
+    CATEGORY_COLUMNS = ['CategoryName', 'ProductName', 'ShipCountry', 'CustomerID']
+    
+    def __init__(self, backend='pandas', verbose=True, inplace=False):
+        """
+        Initializes the transformer.
+        
+        Parameters:
+        -----------
+        backend : str
+            'pandas' (default) or 'polars': engine used by transform_sales_data
+        verbose : bool
+            If True, the methods print their progress (and the quality report).
+            If False, the messages go to this module's logger at DEBUG level,
+            e.g. when the transformer is called once per batch.
+        inplace : bool
+            If True, the methods change the DataFrame they receive
+            (new columns, converted dates and categories) and return it,
+            instead of working on a shallow copy. Only for callers that own
+            the frame. Applies to the polars backend too (its features are
+            added to the cleaned frame).
+        """
+        if backend not in ('pandas', 'polars'):
+            raise ValueError(f"Unknown backend: {backend!r} (use 'pandas' or 'polars')")
+        if backend == 'polars' and pl is None:
+            raise ImportError("backend='polars' needs the polars package")
+        
+        self.backend = backend
+        self.verbose = verbose
+        self.inplace = inplace
+    
+    
+    def _log(self, message):
+        """
+        Prints the message, or logs it at DEBUG level when not verbose.
+        """
+        if self.verbose:
+            print(message)
+        else:
+            logger.debug(message)
+    
+    
+    def transform_sales_data(self, df):
+        """
+        Runs the three transformation steps: cleaning, temporal features
+        and business features.
+        
+        With the polars backend the cleaning runs in pandas and the
+        features are a single Polars lazy query (multithreaded, collected
+        once), converted back to pandas with the same columns and dtypes
+        as the pandas steps.
+        """
+        if self.backend == 'polars':
+            return self._transform_polars(df)
+        
+        df_clean = self.clean_sales_data(df)
+        df_time = self.create_time_features(df_clean)
+        
+        return self.create_business_features(df_time)
+    
+    
+    def _transform_polars(self, df):
+        """
+        clean_sales_data + Polars version of create_time_features and
+        create_business_features.
+        
+        Only the columns the features are computed from go through Polars,
+        so the input columns keep the dtypes (and category order) of
+        clean_sales_data.
+        """
+        df_clean = self.clean_sales_data(df)
+        
+        self._log("⚡ Transforming with Polars (lazy query)...")
+        
+        def bins(expr, edges, labels):
+            # Right-closed bins like pd.cut: (.., edges[0]], (edges[0], edges[1]]...
+            binned = pl.when(expr <= edges[0]).then(pl.lit(labels[0]))
+            for edge, label in zip(edges[1:], labels[1:]):
+                binned = binned.when(expr <= edge).then(pl.lit(label))
+            return binned.otherwise(pl.lit(labels[-1])).cast(pl.Enum(labels))
+        
+        order_date = pl.col('OrderDate')
+        discount = pl.col('Discount')
+        delivery_days = pl.col('DeliveryDays')
+        
+        # Only the feature inputs are converted to Polars
+        inputs = ['OrderDate', 'ShippedDate', 'Total', 'Quantity', 'Discount']
+        lf = pl.from_pandas(df_clean[inputs]).lazy()
+        
+        # Temporal features (Polars returns the date parts as int8)
+        lf = lf.with_columns(
+            Year=order_date.dt.year(),
+            Month=order_date.dt.month().cast(pl.Int32),
+            Quarter=order_date.dt.quarter().cast(pl.Int32),
+            DayOfWeek=(order_date.dt.weekday() - 1).cast(pl.Int32),  # 0 = Monday
+            WeekOfYear=order_date.dt.week(),
+            MonthName=order_date.dt.month().replace_strict(
+                dict(enumerate(self.MONTH_NAMES, start=1)),
+                return_dtype=pl.Enum(self.MONTH_NAMES)
+            )
+        ).with_columns(
+            YearMonth=pl.col('Year').cast(pl.Int32) * 100 + pl.col('Month').cast(pl.Int32),
+            DayName=pl.col('DayOfWeek').replace_strict(
+                dict(enumerate(self.DAY_NAMES)),
+                return_dtype=pl.Enum(self.DAY_NAMES)
+            )
+        )
+        
+        # Business features (same bins and null rules as the pandas version)
+        lf = lf.with_columns(
+            OrderSize=bins(pl.col('Total'), [100, 500, 1000, 5000], self.ORDER_SIZE_LABELS),
+            # from_pandas turns a NaN Discount into null: 0 like in pandas
+            HasDiscount=(discount > 0).fill_null(False).cast(pl.Int8),
+            DiscountLevel=pl.when((discount > -0.01) & (discount <= 1)).then(
+                bins(discount, [0, 0.05, 0.15, 0.25], self.DISCOUNT_LEVEL_LABELS)
+            ),
+            # Floor division like the pandas version (total_days rounds toward zero)
+            DeliveryDays=((pl.col('ShippedDate') - order_date).dt.total_seconds() // 86_400).cast(pl.Int16)
+        ).with_columns(
+            DeliverySpeed=pl.when(delivery_days > -1).then(
+                bins(delivery_days, [3, 7, 14], self.DELIVERY_SPEED_LABELS)
+            ),
+            RevenuePerUnit=pl.when(pl.col('Quantity') != 0).then(pl.col('Total') / pl.col('Quantity'))
+        )
+        
+        features = lf.drop(inputs).collect(engine='streaming').to_pandas()
+        
+        # Same dtypes as the pandas version where the conversion differs
+        features['WeekOfYear'] = features['WeekOfYear'].astype('UInt32')
+        features['DeliveryDays'] = features['DeliveryDays'].astype('Int16')
+        for col in ['MonthName', 'DayName']:
+            features[col] = features[col].cat.as_unordered()
+        
+        # Both frames have a fresh RangeIndex (clean_sales_data resets it)
+        for col in features.columns:
+            df_clean[col] = features[col]
+        
+        self._log(f"✅ Transformation completed: {len(df_clean):,} records, "
+                  f"{len(features.columns)} features created")
+        
+        return df_clean
     
     
     def clean_sales_data(self, df):
         """
         Cleans sales data.
         
+        Duplicates, non-positive totals, invalid quantities and invalid
+        dates are already filtered by the extraction query, which also
+        returns the dates as datetime (see DataExtractor.extract_sales_data).
+        
         Steps:
-        1. Removes duplicates
-        2. Removes invalid values (negative, null)
-        3. Converts dates to datetime
+        1. Converts dates to datetime (only when they are not already)
+        2. Converts the CATEGORY_COLUMNS to categories
+        3. Moves the remaining NumPy-backed columns to Arrow dtypes
         4. Resets index
         
         Parameters:
@@ -42,45 +268,49 @@ class DataTransformer:
         --------
         DataFrame
             Cleaned data
-        """
-        
-        print("🧹 Starting data cleaning...")
-        
-        # 1. Creates a copy (doesn't modify original)
-        df_clean = df.copy()
-        
-        # 2. Removes duplicates
-        before = len(df_clean)
-        df_clean = df_clean.drop_duplicates()
-        after = len(df_clean)
-        print(f"  ➜ Removed {before - after:,} duplicates")
-        
-        # 3. Removes negative values in Total
-        before = len(df_clean)
-        df_clean = df_clean[df_clean['Total'] > 0]
-        after = len(df_clean)
-        print(f"  ➜ Removed {before - after:,} records with negative total")
         
-        # 4. Removes invalid quantities
-        before = len(df_clean)
-        df_clean = df_clean[df_clean['Quantity'] > 0]
-        after = len(df_clean)
-        print(f"  ➜ Removed {before - after:,} records with invalid quantity")
-        
-        # 5. Converts OrderDate to datetime
-        df_clean['OrderDate'] = pd.to_datetime(df_clean['OrderDate'], errors='coerce')
-        df_clean['ShippedDate'] = pd.to_datetime(df_clean['ShippedDate'], errors='coerce')
-        
-        # 6. Removes rows where OrderDate is NaT (invalid)
-        before = len(df_clean)
-        df_clean = df_clean.dropna(subset=['OrderDate'])
-        after = len(df_clean)
-        print(f"  ➜ Removed {before - after:,} records with invalid date")
-        
-        # 7. Resets index
-        df_clean = df_clean.reset_index(drop=True)
+        The input is not modified (unless inplace=True). The result is a
+        shallow copy: columns that are not converted share their data with
+        the input.
+        """
         
-        print(f"✅ Cleaning completed: {len(df_clean):,} valid records")
+        self._log("🧹 Starting data cleaning...")
+        
+        # 1. Creates a shallow copy (doesn't modify original)
+        df_clean = df if self.inplace else df.copy(deep=False)
+        
+        # 2. Converts the dates to datetime
+        # (the extractor already returns datetime: nothing to parse)
+        for col in ['OrderDate', 'ShippedDate']:
+            if not pd.api.types.is_datetime64_any_dtype(df_clean[col]):
+                df_clean[col] = pd.to_datetime(df_clean[col])
+        
+        # 3. Converts the group key columns to categories
+        # (int codes instead of strings in the later groupbys;
+        # the extractor already returns some of them as categories)
+        for col in self.CATEGORY_COLUMNS:
+            if col in df_clean.columns and not isinstance(df_clean[col].dtype, pd.CategoricalDtype):
+                df_clean[col] = df_clean[col].astype('category')
+        
+        # 4. Moves the remaining NumPy-backed columns to Arrow dtypes
+        # (the extractor already returns them as Arrow: nothing to convert;
+        # dates and categories stay as they are for the NumPy kernels)
+        for col in df_clean.columns:
+            dtype = df_clean[col].dtype
+            if isinstance(dtype, (pd.ArrowDtype, pd.CategoricalDtype)) or pd.api.types.is_datetime64_any_dtype(dtype):
+                continue
+            if isinstance(dtype, np.dtype) and dtype != object:
+                # Same type as the NumPy one, whatever the values
+                # (convert_dtypes would make whole-number floats integers)
+                df_clean[col] = df_clean[col].astype(pd.ArrowDtype(pa.from_numpy_dtype(dtype)))
+            else:
+                # Text (and other object columns): type inferred from the values
+                df_clean[col] = df_clean[col].convert_dtypes(dtype_backend='pyarrow', convert_integer=False)
+        
+        # 5. Resets index
+        df_clean.reset_index(drop=True, inplace=True)
+        
+        self._log(f"✅ Cleaning completed: {len(df_clean):,} valid records")
         
         return df_clean
     
@@ -93,38 +323,44 @@ class DataTransformer:
         - Temporal analysis (sales by month, quarter)
         - Machine Learning (if needed later)
         - Facilitates grouping
+        
+        The input is not modified (unless inplace=True): the new columns
+        are added to a shallow copy, which shares the existing columns' data.
         """
         
-        print("📅 Creating temporal features...")
+        self._log("📅 Creating temporal features...")
         
-        df_transformed = df.copy()
+        df_transformed = df if self.inplace else df.copy(deep=False)
         
-        # Extracts date components
-        df_transformed['Year'] = df_transformed['OrderDate'].dt.year
-        df_transformed['Month'] = df_transformed['OrderDate'].dt.month
-        df_transformed['Quarter'] = df_transformed['OrderDate'].dt.quarter
-        df_transformed['DayOfWeek'] = df_transformed['OrderDate'].dt.dayofweek
-        df_transformed['WeekOfYear'] = df_transformed['OrderDate'].dt.isocalendar().week
+        # Extracts date components (one .dt accessor for all of them)
+        order_date = df_transformed['OrderDate'].dt
+        df_transformed['Year'] = order_date.year
+        df_transformed['Month'] = order_date.month
+        df_transformed['Quarter'] = order_date.quarter
+        df_transformed['DayOfWeek'] = order_date.dayofweek
+        df_transformed['WeekOfYear'] = order_date.isocalendar().week
         
         # Creates month name (more readable)
-        month_names = {
-            1: 'Jan', 2: 'Feb', 3: 'Mar', 4: 'Apr',
-            5: 'May', 6: 'Jun', 7: 'Jul', 8: 'Aug',
-            9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dec'
-        }
-        df_transformed['MonthName'] = df_transformed['Month'].map(month_names)
+        # Categorical built from the month number: int8 codes + 12 labels
+        df_transformed['MonthName'] = pd.Categorical.from_codes(
+            df_transformed['Month'].to_numpy() - 1,
+            categories=self.MONTH_NAMES
+        )
         
         # Creates Year-Month column
-        df_transformed['YearMonth'] = df_transformed['OrderDate'].dt.strftime('%Y-%m')
+        # int key YYYYMM (e.g. 202401) from Year and Month: no string per row,
+        # sorts in date order, formatted as "2024-01" only in the reports
+        df_transformed['YearMonth'] = (
+            df_transformed['Year'].astype('int32') * 100 + df_transformed['Month'].astype('int32')
+        )
         
-        # Creates day of week name
-        day_names = {
-            0: 'Monday', 1: 'Tuesday', 2: 'Wednesday', 3: 'Thursday',
-            4: 'Friday', 5: 'Saturday', 6: 'Sunday'
-        }
-        df_transformed['DayName'] = df_transformed['DayOfWeek'].map(day_names)
+        # Creates day of week name (dayofweek is already 0 = Monday)
+        df_transformed['DayName'] = pd.Categorical.from_codes(
+            df_transformed['DayOfWeek'].to_numpy(),
+            categories=self.DAY_NAMES
+        )
         
-        print(f"✅ {8} temporal features created")
+        self._log(f"✅ {8} temporal features created")
         
         return df_transformed
     
@@ -137,45 +373,112 @@ class DataTransformer:
         - Order size classification
         - Discount flags
         - Delivery time
+        
+        The input is not modified (unless inplace=True): the new columns
+        are added to a shallow copy, which shares the existing columns' data.
+        
+        Column types are pinned to the smallest that fit:
+        - HasDiscount: int8
+        - DeliveryDays: Int16 (nullable, <NA> when not shipped;
+          ValueError if a delivery time does not fit)
+        - OrderSize, DiscountLevel, DeliverySpeed: categories with int8 codes
+        - RevenuePerUnit: float64 (same precision as Total, NaN when Quantity is 0)
         """
         
-        print("💼 Creating business features...")
+        self._log("💼 Creating business features...")
         
-        df_transformed = df.copy()
+        df_transformed = df if self.inplace else df.copy(deep=False)
+        
+        # Input columns as numpy arrays, read once: every feature below is
+        # computed on these and only the results are assigned as columns
+        total = df_transformed['Total'].to_numpy(dtype=np.float64)
+        quantity = df_transformed['Quantity'].to_numpy(dtype=np.float64)
+        discount = df_transformed['Discount'].to_numpy(dtype=np.float64)
+        shipped = df_transformed['ShippedDate'].to_numpy(dtype='datetime64[s]')
+        ordered = df_transformed['OrderDate'].to_numpy(dtype='datetime64[s]')
         
         # 1. Classifies order size
-        df_transformed['OrderSize'] = pd.cut(
-            df_transformed['Total'],
-            bins=[0, 100, 500, 1000, 5000, float('inf')],
-            labels=['Very Small', 'Small', 'Medium', 'Large', 'VIP']
+        # Binary search on the bin edges gives the category codes directly
+        # (side='left' keeps the intervals right-closed like pd.cut: 100 is 'Very Small').
+        # Total is always > 0 here, the extraction query filters the rest
+        order_size_edges = np.array([100, 500, 1000, 5000], dtype=np.float64)
+        order_size_codes = np.searchsorted(order_size_edges, total, side='left').astype(np.int8)
+        df_transformed['OrderSize'] = pd.Categorical.from_codes(
+            order_size_codes,
+            categories=self.ORDER_SIZE_LABELS,
+            ordered=True
         )
         
+        # Delivery time (days between order and shipping)
+        # Subtracts the int64 seconds behind the dates instead of building
+        # a timedelta Series; orders not shipped yet (NaT) get <NA>
+        not_shipped = np.isnat(shipped) | np.isnat(ordered)
+        delivery_days = (shipped.view(np.int64) - ordered.view(np.int64)) // 86_400
+        delivery_days[not_shipped] = 0
+        # Checked like the extractor casts: out of range raises instead of wrapping
+        int16 = np.iinfo(np.int16)
+        if delivery_days.size and (delivery_days.min() < int16.min or delivery_days.max() > int16.max):
+            raise ValueError(
+                f"DeliveryDays out of int16 range: {delivery_days.min()} to {delivery_days.max()} days"
+            )
+        delivery_days = delivery_days.astype(np.int16)
+        
+        # 2, 3, 5 and 6 (discount flag, discount category, delivery speed,
+        # revenue per unit) are computed together by the numba kernel
+        # when it's available
+        days = np.where(not_shipped, np.nan, delivery_days)
+        
+        if numba is not None:
+            has_discount, discount_codes, delivery_codes, revenue_per_unit = _business_features(
+                discount, total, quantity, days
+            )
+        else:
+            # bool and int8 have the same size: reinterpreted in place, no second pass
+            has_discount = (discount > 0).view(np.int8)
+            
+            # Same binary search as OrderSize: (-0.01, 0] is 'No Discount', (0, 0.05] 'Low'...
+            # Values outside (-0.01, 1] have no category (code -1), as with pd.cut
+            discount_edges = np.array([0, 0.05, 0.15, 0.25], dtype=np.float64)
+            discount_codes = np.searchsorted(discount_edges, discount, side='left').astype(np.int8)
+            discount_codes[~((discount > -0.01) & (discount <= 1))] = -1
+            
+            # (-1, 3] is 'Express', (3, 7] 'Fast'...
+            # Orders not shipped yet (NaN days) have no category
+            delivery_edges = np.array([3, 7, 14], dtype=np.float64)
+            delivery_codes = np.searchsorted(delivery_edges, days, side='left').astype(np.int8)
+            delivery_codes[~(days > -1)] = -1
+            
+            # Masked divide: NaN where Quantity is 0, without a division by zero
+            revenue_per_unit = np.divide(
+                total, quantity,
+                out=np.full(total.shape, np.nan, dtype=np.float64),
+                where=quantity != 0
+            )
+        
         # 2. Discount flag (1 if has discount, 0 if not)
-        df_transformed['HasDiscount'] = np.where(df_transformed['Discount'] > 0, 1, 0)
+        df_transformed['HasDiscount'] = has_discount
         
         # 3. Discount category
-        df_transformed['DiscountLevel'] = pd.cut(
-            df_transformed['Discount'],
-            bins=[-0.01, 0, 0.05, 0.15, 0.25, 1],
-            labels=['No Discount', 'Low', 'Medium', 'High', 'Very High']
+        df_transformed['DiscountLevel'] = pd.Categorical.from_codes(
+            discount_codes,
+            categories=self.DISCOUNT_LEVEL_LABELS,
+            ordered=True
         )
         
-        # 4. Delivery time (days between order and shipping)
-        df_transformed['DeliveryDays'] = (
-            df_transformed['ShippedDate'] - df_transformed['OrderDate']
-        ).dt.days
+        # 4. Delivery time
+        df_transformed['DeliveryDays'] = pd.arrays.IntegerArray(delivery_days, not_shipped)
         
         # 5. Delivery speed classification
-        df_transformed['DeliverySpeed'] = pd.cut(
-            df_transformed['DeliveryDays'],
-            bins=[-1, 3, 7, 14, float('inf')],
-            labels=['Express', 'Fast', 'Normal', 'Slow']
+        df_transformed['DeliverySpeed'] = pd.Categorical.from_codes(
+            delivery_codes,
+            categories=self.DELIVERY_SPEED_LABELS,
+            ordered=True
         )
         
         # 6. Revenue per unit
-        df_transformed['RevenuePerUnit'] = df_transformed['Total'] / df_transformed['Quantity']
+        df_transformed['RevenuePerUnit'] = revenue_per_unit
         
-        print(f"✅ {6} business features created")
+        self._log(f"✅ {6} business features created")
         
         return df_transformed
     
@@ -190,45 +493,77 @@ class DataTransformer:
         - Basic statistics
         """
         
-        print("\n" + "="*60)
-        print("📊 DATA QUALITY REPORT")
-        print("="*60)
+        # Nothing would be shown: skips the statistics altogether
+        if not self.verbose and not logger.isEnabledFor(logging.DEBUG):
+            return None
+        
+        self._log("\n" + "="*60)
+        self._log("📊 DATA QUALITY REPORT")
+        self._log("="*60)
+        
+        n_rows = len(df)
         
         # 1. General info
-        print(f"\n📈 Total records: {len(df):,}")
-        print(f"📈 Total columns: {len(df.columns)}")
+        self._log(f"\n📈 Total records: {n_rows:,}")
+        self._log(f"📈 Total columns: {len(df.columns)}")
         
         # 2. Missing values
-        print("\n🔍 Missing values per column:")
-        missing = df.isnull().sum()
+        self._log("\n🔍 Missing values per column:")
+        # Null counts read from the Arrow columns (a per-column scalar,
+        # Arrow-backed columns aren't copied), instead of a full boolean frame
+        # (object columns with mixed types can't be converted: pandas count)
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            missing = pd.Series(
+                [table.column(i).null_count for i in range(table.num_columns)],
+                index=df.columns
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            missing = df.isnull().sum()
         missing = missing[missing > 0]
         
         if len(missing) == 0:
-            print("  ✅ No missing values!")
+            self._log("  ✅ No missing values!")
         else:
             for col, count in missing.items():
-                percent = (count / len(df)) * 100
-                print(f"  ➜ {col}: {count:,} ({percent:.2f}%)")
+                percent = (count / n_rows) * 100
+                self._log(f"  ➜ {col}: {count:,} ({percent:.2f}%)")
         
         # 3. Basic statistics for Total
-        print("\n📊 Total Statistics:")
-        print(df['Total'].describe())
+        # Same numbers as describe(), computed on the numpy array
+        # (one call for the three quartiles)
+        self._log("\n📊 Total Statistics:")
+        total = df['Total'].to_numpy(dtype=np.float64, na_value=np.nan)
+        total = total[~np.isnan(total)]
+        if total.size > 0:
+            q25, q50, q75 = np.quantile(total, [0.25, 0.5, 0.75])
+            stats = pd.Series(
+                [total.size, total.mean(), total.std(ddof=1), total.min(), q25, q50, q75, total.max()],
+                index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+                name='Total'
+            )
+            self._log(stats)
+        else:
+            self._log("  ➜ No values")
         
         # 4. Date range
         if 'OrderDate' in df.columns:
-            print(f"\n📅 Date range:")
-            print(f"  ➜ First order: {df['OrderDate'].min()}")
-            print(f"  ➜ Last order: {df['OrderDate'].max()}")
-            print(f"  ➜ Period: {(df['OrderDate'].max() - df['OrderDate'].min()).days} days")
+            # min and max computed once each and reused for the period
+            first_order, last_order = df['OrderDate'].agg(['min', 'max'])
+            self._log(f"\n📅 Date range:")
+            self._log(f"  ➜ First order: {first_order}")
+            self._log(f"  ➜ Last order: {last_order}")
+            self._log(f"  ➜ Period: {(last_order - first_order).days} days")
         
         # 5. Top categories
         if 'CategoryName' in df.columns:
-            print(f"\n📦 Top 5 Categories by revenue:")
-            top_cat = df.groupby('CategoryName')['Total'].sum().sort_values(ascending=False).head(5)
+            self._log(f"\n📦 Top 5 Categories by revenue:")
+            # nlargest: partial sort of the groups instead of sorting all of them
+            top_cat = df.groupby('CategoryName', observed=True, sort=False)['Total'].sum().nlargest(5)
             for cat, revenue in top_cat.items():
-                print(f"  ➜ {cat}: ${revenue:,.2f}")
+                self._log(f"  ➜ {cat}: ${revenue:,.2f}")
         
-        print("="*60 + "\n")
+        self._log("="*60 + "\n")
         
         return None
 
@@ -272,9 +607,14 @@ if __name__ == "__main__":
     print(f"\n📊 Final shape: {df_final.shape}")
     print(f"📊 Total columns: {len(df_final.columns)}")
     
-    # Saves temporarily
-    df_final.to_csv('data/processed/sales_transformed.csv', index=False)
-    print("\n💾 Data saved to: data/processed/sales_transformed.csv")
+    # Saves temporarily (Parquet, or CSV with --csv)
+    import sys
+    from load import DataLoader
+    print()
+    if '--csv' in sys.argv[1:]:
+        DataLoader().save_to_csv(df_final, 'sales_transformed.csv')
+    else:
+        DataLoader().save_to_parquet(df_final, 'sales_transformed.parquet')
     
     print("\n" + "="*60)
     print("✅ ALL TRANSFORMATION TESTS PASSED!")